@@ -1,10 +1,19 @@
 import os
-from flask import Flask, jsonify, request, make_response, g
+import re
+import time
+import orjson
+from flask import Flask, request, g, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument, WriteConcern
+from pymongo.errors import DuplicateKeyError, PyMongoError
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from dotenv import load_dotenv
 
-from db import get_db, close_db
+from db import get_db, get_collection, search_keys, SEARCH_KEYS
 from auth import setup_auth_routes, token_required, roles_required
 
 load_dotenv()
@@ -15,19 +24,123 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your_default_secret_key')
 app.config['MONGO_URI'] = os.environ.get('MONGO_URI', 'mongodb://localhost:27017/')
 app.config['DB_NAME'] = os.environ.get('DB_NAME', 'roc_gym_db')
+app.config['BCRYPT_ROUNDS'] = int(os.environ.get('BCRYPT_ROUNDS', '10'))
 
 
-# Register teardown function to close DB connection
-app.teardown_appcontext(close_db)
+# --- Helper Functions ---
+# Fields a client may request from GET /jobs via ?fields=
+JOB_FIELDS = (
+    "company_name", "title", "description", "location", "work_type", "salary_range",
+    "requirements", "views", "date_posted", "posted_by", "updated_by", "updated_at"
+)
 
-# --- Helper Function ---
-def serialize_doc(doc):
-    """Converts a MongoDB doc to a JSON-serializable format."""
-    if '_id' in doc:
-        doc['_id'] = str(doc['_id'])
-    if 'job_id' in doc and isinstance(doc['job_id'], ObjectId):
-        doc['job_id'] = str(doc['job_id'])
-    return doc
+# Projection that keeps the lowercased search copies out of job responses
+_PUBLIC_JOB = dict.fromkeys(SEARCH_KEYS.values(), 0)
+
+# Write concern for fire-and-forget counters such as job views
+_UNACKNOWLEDGED = WriteConcern(w=0)
+
+# Number of documents fetched from MongoDB and serialized per streamed chunk
+STREAM_BATCH_SIZE = 500
+
+def _oid(value):
+    """Parses a path parameter into an ObjectId, or returns None if it isn't one."""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+def _job_filter(job_oid):
+    """
+    Filter for writing a job as the current user. Admins can write any job, recruiters
+    only their own, so a miss for a recruiter may mean the job belongs to someone else.
+    """
+    if g.current_user_role == 'recruiter':
+        return {"_id": job_oid, "posted_by": g.current_user_id}
+    return {"_id": job_oid}
+
+def _prefix_match(term):
+    """
+    Case-insensitive prefix filter on a lowercased search copy. MongoDB turns an anchored,
+    case-sensitive regex into a bounded range on the copy's index; with the 'i' option on
+    the original field it would walk every key.
+    """
+    return {'$regex': '^' + re.escape(term.lower())}
+
+def _jobs_query(args):
+    """MongoDB filter for GET /jobs from its title, location and work_type parameters."""
+    query = {}
+    title = args.get('title')
+    location = args.get('location')
+    work_type = args.get('work_type')
+
+    if title:
+        query['title_lc'] = _prefix_match(title)
+    if location:
+        query['location_lc'] = _prefix_match(location)
+    if work_type:
+        query['work_type'] = work_type
+    return query
+
+def _json_default(obj):
+    """orjson fallback for types it can't encode natively; ObjectIds are by far the most common."""
+    if type(obj) is ObjectId:
+        return obj.binary.hex()
+    return str(obj)
+
+def _dumps(payload):
+    """Encodes MongoDB docs as JSON, with naive datetimes marked as UTC."""
+    return orjson.dumps(payload, default=_json_default, option=orjson.OPT_NAIVE_UTC)
+
+def _json_response(payload, status=200):
+    """Builds a JSON response using orjson instead of the stdlib encoder behind jsonify."""
+    return app.response_class(_dumps(payload), status=status, mimetype='application/json')
+
+def _json_stream(docs, key=None, **fields):
+    """
+    Streams documents as a JSON array one batch at a time instead of building the full list.
+    With `key`, the array is nested under it next to `fields` and a trailing `count`.
+
+    The first batch is fetched before returning, so a failing query raises in the view
+    rather than after a 200 status has been sent.
+    """
+    cursor = iter(docs)
+    first_batch = list(islice(cursor, STREAM_BATCH_SIZE))
+
+    def generate():
+        if key is None:
+            yield b'['
+        else:
+            yield _dumps(fields)[:-1] + (b',' if fields else b'') + _dumps(key) + b':['
+        batch = first_batch
+        count = 0
+        while batch:
+            yield (b',' if count else b'') + _dumps(batch)[1:-1]
+            count += len(batch)
+            batch = list(islice(cursor, STREAM_BATCH_SIZE))
+        yield b']' if key is None else b'],"count":' + str(count).encode() + b'}'
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """Parses request bodies and encodes jsonify() responses with orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return _dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # orjson already returns the body bytes; the default builds a str and re-encodes it.
+        # Takes jsonify's arguments like Flask does: one value, several (as a list),
+        # keyword arguments (as an object), or nothing (null), but not both kinds at once
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        if len(args) == 1:
+            return _json_response(args[0])
+        return _json_response(args or kwargs or None)
+
+app.json = _OrjsonProvider(app)
 
 # --- Setup Authentication Routes ---
 setup_auth_routes(app)
@@ -35,37 +148,49 @@ setup_auth_routes(app)
 
 # --- Home and Health Endpoints ---
 
+# The home payload never changes, so it is encoded once at import
+_HOME_BODY = _dumps({
+    "message": "ROC Gym - Job Listing and Employee Management API",
+    "company": "ROC Gym",
+    "version": "1.0.0",
+    "endpoints": {
+        "health": "/health",
+        "auth": {
+            "register": "/auth/register",
+            "login": "/auth/login",
+            "logout": "/auth/logout"
+        },
+        "jobs": {
+            "list": "/jobs",
+            "get": "/jobs/<id>",
+            "create": "/jobs (POST, requires auth: admin/recruiter)",
+            "update": "/jobs/<id> (PUT, requires auth: admin/recruiter)",
+            "delete": "/jobs/<id> (DELETE, requires auth: admin/recruiter)",
+            "apply": "/jobs/<id>/apply (POST, requires auth: user)",
+            "applications": "/jobs/<id>/applications (GET, requires auth: admin/recruiter)"
+        },
+        "applications": {
+            "my_applications": "/applications (GET, requires auth)"
+        },
+        "members": {
+            "list": "/members (GET, requires auth: admin)"
+        }
+    }
+})
+
+@lru_cache(maxsize=1)
+def _healthy_body(second):
+    """Encoded healthy response, rebuilt at most once per second of wall-clock time."""
+    return _dumps({
+        "status": "healthy",
+        "database": "connected",
+        "timestamp": datetime.utcfromtimestamp(second).isoformat()
+    })
+
 @app.route("/", methods=["GET"])
 def home():
     """Home endpoint providing API information"""
-    return make_response(jsonify({
-        "message": "ROC Gym - Job Listing and Employee Management API",
-        "company": "ROC Gym",
-        "version": "1.0.0",
-        "endpoints": {
-            "health": "/health",
-            "auth": {
-                "register": "/auth/register",
-                "login": "/auth/login",
-                "logout": "/auth/logout"
-            },
-            "jobs": {
-                "list": "/jobs",
-                "get": "/jobs/<id>",
-                "create": "/jobs (POST, requires auth: admin/recruiter)",
-                "update": "/jobs/<id> (PUT, requires auth: admin/recruiter)",
-                "delete": "/jobs/<id> (DELETE, requires auth: admin/recruiter)",
-                "apply": "/jobs/<id>/apply (POST, requires auth: user)",
-                "applications": "/jobs/<id>/applications (GET, requires auth: admin/recruiter)"
-            },
-            "applications": {
-                "my_applications": "/applications (GET, requires auth)"
-            },
-            "members": {
-                "list": "/members (GET, requires auth: admin)"
-            }
-        }
-    }), 200)
+    return app.response_class(_HOME_BODY, status=200, mimetype='application/json')
 
 @app.route("/health", methods=["GET"])
 def health_check():
@@ -74,18 +199,14 @@ def health_check():
         db = get_db()
         # Test database connection
         db.command('ping')
-        return make_response(jsonify({
-            "status": "healthy",
-            "database": "connected",
-            "timestamp": datetime.utcnow().isoformat()
-        }), 200)
+        return app.response_class(_healthy_body(int(time.time())), status=200, mimetype='application/json')
     except Exception as e:
-        return make_response(jsonify({
+        return _json_response({
             "status": "unhealthy",
             "database": "disconnected",
             "error": str(e),
             "timestamp": datetime.utcnow().isoformat()
-        }), 503)
+        }, 503)
 
 
 # --- Job API Endpoints ---
@@ -96,12 +217,11 @@ def health_check():
 def create_job():
     """Create a new job listing (Admin/Recruiter only)"""
     data = request.get_json()
-    db = get_db()
-    jobs_collection = db.jobs
+    jobs_collection = get_collection('jobs')
 
     required_fields = ["title", "description", "location", "work_type"]
     if not all(field in data for field in required_fields):
-        return make_response(jsonify({"error": "Missing required job fields"}), 400)
+        return _json_response({"error": "Missing required job fields"}, 400)
 
     new_job = {
         "company_name": data.get("company_name", "ROC Gym"),
@@ -116,80 +236,79 @@ def create_job():
         "posted_by": g.current_user_id # Link job to the user who posted it
     }
 
-    result = jobs_collection.insert_one(new_job)
-    created_job = jobs_collection.find_one({"_id": result.inserted_id})
-    return make_response(jsonify(serialize_doc(created_job)), 201)
+    result = jobs_collection.insert_one({**new_job, **search_keys(new_job)})
+    new_job['_id'] = result.inserted_id
+    return _json_response(new_job, 201)
 
 @app.route("/jobs", methods=["GET"])
 def get_all_jobs():
     """Retrieve all job listings with filtering"""
-    db = get_db()
-    jobs_collection = db.jobs
+    jobs_collection = get_collection('jobs')
     
-    query = {}
-    title = request.args.get('title')
-    location = request.args.get('location')
-    work_type = request.args.get('work_type')
+    query = _jobs_query(request.args)
 
-    if title:
-        query['title'] = {'$regex': title, '$options': 'i'}
-    if location:
-        query['location'] = {'$regex': location, '$options': 'i'}
-    if work_type:
-        query['work_type'] = work_type
+    # Only fetch the requested fields, e.g. ?fields=title,location for summary views
+    projection = _PUBLIC_JOB
+    fields = request.args.get('fields')
+    if fields:
+        requested = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in requested if field not in JOB_FIELDS]
+        if unknown:
+            return _json_response({"error": f"Unknown job fields: {', '.join(unknown)}"}, 400)
+        projection = dict.fromkeys(requested, 1)
 
-    all_jobs = [serialize_doc(job) for job in jobs_collection.find(query)]
-    return make_response(jsonify(all_jobs), 200)
+    return _json_stream(jobs_collection.find(query, projection, batch_size=STREAM_BATCH_SIZE))
 
 @app.route("/jobs/<string:job_id>", methods=["GET"])
 def get_job_by_id(job_id):
     """Retrieve a single job listing by ID and increment views"""
-    db = get_db()
-    jobs_collection = db.jobs
+    job_oid = _oid(job_id)
+    if job_oid is None:
+        return _json_response({"error": "Invalid job ID format"}, 400)
+    jobs_collection = get_collection('jobs')
     
-    try:
-        # Increment the view count
-        result = jobs_collection.find_one_and_update(
-            {"_id": ObjectId(job_id)},
-            {"$inc": {"views": 1}},
-            return_document=True
-        )
-        if result:
-            return make_response(jsonify(serialize_doc(result)), 200)
-        else:
-            return make_response(jsonify({"error": "Job not found"}), 404)
-    except Exception:
-        return make_response(jsonify({"error": "Invalid job ID format"}), 400)
+    job = jobs_collection.find_one({"_id": job_oid}, _PUBLIC_JOB)
+    if not job:
+        return _json_response({"error": "Job not found"}, 404)
+
+    # Increment the view count without waiting for an acknowledgement; a lost
+    # increment is harmless and the read no longer waits on the write
+    jobs_collection.with_options(write_concern=_UNACKNOWLEDGED).update_one(
+        {"_id": job_oid}, {"$inc": {"views": 1}}
+    )
+    job['views'] = job.get('views', 0) + 1
+    return _json_response(job, 200)
 
 @app.route("/jobs/<string:job_id>", methods=["PUT"])
 @token_required
 @roles_required('admin', 'recruiter')
 def update_job(job_id):
     """Update an existing job listing"""
+    job_oid = _oid(job_id)
+    if job_oid is None:
+        return _json_response({"error": "Invalid job ID format"}, 400)
     data = request.get_json()
-    db = get_db()
-    jobs_collection = db.jobs
-
-    try:
-        job = jobs_collection.find_one({"_id": ObjectId(job_id)})
-        if not job:
-            return make_response(jsonify({"error": "Job not found"}), 404)
-
-        # Check permissions: Admin can edit any job, Recruiter can only edit their own.
-        if g.current_user_role == 'recruiter' and job.get('posted_by') != g.current_user_id:
-            return make_response(jsonify({"error": "Permission denied: You can only update jobs you have posted"}), 403)
-
-        # Always set updated_by and updated_at on an update
-        data['updated_by'] = g.current_user_id
-        data['updated_at'] = datetime.utcnow()
-
-        update_result = jobs_collection.update_one({"_id": ObjectId(job_id)}, {"$set": data})
-        if update_result.modified_count > 0:
-            updated_job = jobs_collection.find_one({"_id": ObjectId(job_id)})
-            return make_response(jsonify(serialize_doc(updated_job)), 200)
-        return make_response(jsonify({"message": "No changes made"}), 200)
-    except Exception:
-        return make_response(jsonify({"error": "Invalid job ID format"}), 400)
+    if not isinstance(data, dict):
+        return _json_response({"error": "Request body must be a JSON object"}, 400)
+    jobs_collection = get_collection('jobs')
+
+    # _id is immutable and the search copies follow their fields; always set
+    # updated_by and updated_at on an update
+    data.pop('_id', None)
+    for key in SEARCH_KEYS.values():
+        data.pop(key, None)
+    data.update(search_keys(data))
+    data['updated_by'] = g.current_user_id
+    data['updated_at'] = datetime.utcnow()
+
+    job = jobs_collection.find_one_and_update(
+        _job_filter(job_oid), {"$set": data}, _PUBLIC_JOB, return_document=ReturnDocument.AFTER
+    )
+    if job:
+        return _json_response(job, 200)
+    if g.current_user_role == 'recruiter' and jobs_collection.find_one({"_id": job_oid}, {"_id": 1}):
+        return _json_response({"error": "Permission denied: You can only update jobs you have posted"}, 403)
+    return _json_response({"error": "Job not found"}, 404)
 
 
 @app.route("/jobs/<string:job_id>", methods=["DELETE"])
@@ -197,25 +316,17 @@ def update_job(job_id):
 @roles_required('admin', 'recruiter')
 def delete_job(job_id):
     """Delete a job listing"""
-    db = get_db()
-    jobs_collection = db.jobs
+    job_oid = _oid(job_id)
+    if job_oid is None:
+        return _json_response({"error": "Invalid job ID format"}, 400)
+    jobs_collection = get_collection('jobs')
 
-    try:
-        job = jobs_collection.find_one({"_id": ObjectId(job_id)})
-        if not job:
-            return make_response(jsonify({"error": "Job not found"}), 404)
-        
-        # Admin can delete any job, Recruiter only their own
-        if g.current_user_role == 'recruiter' and job.get('posted_by') != g.current_user_id:
-            return make_response(jsonify({"error": "Permission denied"}), 403)
-
-        result = jobs_collection.delete_one({"_id": ObjectId(job_id)})
-        if result.deleted_count > 0:
-            return make_response(jsonify({"message": "Job deleted successfully"}), 200)
-        else:
-            return make_response(jsonify({"error": "Job not found"}), 404)
-    except Exception:
-        return make_response(jsonify({"error": "Invalid job ID format"}), 400)
+    result = jobs_collection.delete_one(_job_filter(job_oid))
+    if result.deleted_count > 0:
+        return _json_response({"message": "Job deleted successfully"}, 200)
+    if g.current_user_role == 'recruiter' and jobs_collection.find_one({"_id": job_oid}, {"_id": 1}):
+        return _json_response({"error": "Permission denied"}, 403)
+    return _json_response({"error": "Job not found"}, 404)
 
 
 @app.route("/jobs/<string:job_id>/apply", methods=["POST"])
@@ -224,62 +335,54 @@ def apply_for_job(job_id):
     """Apply for a job (Authenticated users only)"""
     # Only 'user' role can apply for jobs (not admin or recruiter)
     if g.current_user_role != 'user':
-        return make_response(jsonify({
+        return _json_response({
             "error": "Only regular users can apply for jobs. Admins and recruiters cannot apply."
-        }), 403)
+        }, 403)
     
+    job_oid = _oid(job_id)
+    if job_oid is None:
+        return _json_response({"error": "Invalid job ID format"}, 400)
     data = request.get_json()
-    db = get_db()
-    jobs_collection = db.jobs
-    applications_collection = db.applications
+    jobs_collection = get_collection('jobs')
+    applications_collection = get_collection('applications')
+    
+    # Check if job exists
+    job = jobs_collection.find_one({"_id": job_oid}, {"_id": 1})
+    if not job:
+        return _json_response({"error": "Job not found"}, 404)
+    
+    # Create application
+    required_fields = ["full_name", "email", "resume_url"]  # resume_url can be a URL or file path
+    if not isinstance(data, dict) or not all(field in data for field in required_fields):
+        return _json_response({
+            "error": "Missing required fields: full_name, email, resume_url"
+        }, 400)
     
+    new_application = {
+        "job_id": job_oid,
+        "applicant_id": g.current_user_id,
+        "full_name": data["full_name"],
+        "email": data["email"],
+        "resume_url": data["resume_url"],
+        "cover_letter": data.get("cover_letter", ""),
+        "additional_info": data.get("additional_info", ""),
+        "status": "pending",  # pending, reviewed, accepted, rejected
+        "applied_at": datetime.utcnow()
+    }
+    
+    # The unique (job_id, applicant_id) index rejects repeat applications atomically
     try:
-        # Check if job exists
-        job = jobs_collection.find_one({"_id": ObjectId(job_id)})
-        if not job:
-            return make_response(jsonify({"error": "Job not found"}), 404)
-        
-        # Check if user has already applied for this job
-        existing_application = applications_collection.find_one({
-            "job_id": ObjectId(job_id),
-            "applicant_id": g.current_user_id
-        })
-        if existing_application:
-            return make_response(jsonify({
-                "error": "You have already applied for this job"
-            }), 409)
-        
-        # Create application
-        required_fields = ["full_name", "email", "resume_url"]  # resume_url can be a URL or file path
-        if not all(field in data for field in required_fields):
-            return make_response(jsonify({
-                "error": "Missing required fields: full_name, email, resume_url"
-            }), 400)
-        
-        new_application = {
-            "job_id": ObjectId(job_id),
-            "applicant_id": g.current_user_id,
-            "full_name": data["full_name"],
-            "email": data["email"],
-            "resume_url": data["resume_url"],
-            "cover_letter": data.get("cover_letter", ""),
-            "additional_info": data.get("additional_info", ""),
-            "status": "pending",  # pending, reviewed, accepted, rejected
-            "applied_at": datetime.utcnow()
-        }
-        
         result = applications_collection.insert_one(new_application)
-        created_application = applications_collection.find_one({"_id": result.inserted_id})
-        
-        return make_response(jsonify({
-            "message": "Application submitted successfully",
-            "application": serialize_doc(created_application)
-        }), 201)
-        
-    except Exception as e:
-        return make_response(jsonify({
-            "error": "Invalid job ID format" if "Invalid" in str(e) else str(e)
-        }), 400)
+    except DuplicateKeyError:
+        return _json_response({
+            "error": "You have already applied for this job"
+        }, 409)
+    new_application['_id'] = result.inserted_id
+    
+    return _json_response({
+        "message": "Application submitted successfully",
+        "application": new_application
+    }, 201)
 
 
 @app.route("/jobs/<string:job_id>/applications", methods=["GET"])
@@ -287,67 +390,62 @@ def apply_for_job(job_id):
 @roles_required('admin', 'recruiter')
 def get_job_applications(job_id):
     """Get all applications for a specific job (Admin/Recruiter only)"""
-    db = get_db()
-    jobs_collection = db.jobs
-    applications_collection = db.applications
+    job_oid = _oid(job_id)
+    if job_oid is None:
+        return _json_response({"error": "Invalid job ID format"}, 400)
+    jobs_collection = get_collection('jobs')
+    applications_collection = get_collection('applications')
     
-    try:
-        # Check if job exists
-        job = jobs_collection.find_one({"_id": ObjectId(job_id)})
-        if not job:
-            return make_response(jsonify({"error": "Job not found"}), 404)
-        
-        # Recruiters can only view applications for their own jobs
-        if g.current_user_role == 'recruiter' and job.get('posted_by') != g.current_user_id:
-            return make_response(jsonify({
-                "error": "Permission denied: You can only view applications for jobs you have posted"
-            }), 403)
-        
-        # Get all applications for this job
-        applications = list(applications_collection.find({"job_id": ObjectId(job_id)}))
-        
-        return make_response(jsonify({
-            "job_id": job_id,
-            "applications": [serialize_doc(app) for app in applications],
-            "count": len(applications)
-        }), 200)
-        
-    except Exception:
-        return make_response(jsonify({"error": "Invalid job ID format"}), 400)
+    # Check if job exists
+    job = jobs_collection.find_one({"_id": job_oid}, {"posted_by": 1})
+    if not job:
+        return _json_response({"error": "Job not found"}, 404)
+    
+    # Recruiters can only view applications for their own jobs
+    if g.current_user_role == 'recruiter' and job.get('posted_by') != g.current_user_id:
+        return _json_response({
+            "error": "Permission denied: You can only view applications for jobs you have posted"
+        }, 403)
+    
+    # Get all applications for this job
+    applications = applications_collection.find({"job_id": job_oid}, batch_size=STREAM_BATCH_SIZE)
+    
+    return _json_stream(applications, "applications", job_id=job_id)
 
 
 @app.route("/applications", methods=["GET"])
 @token_required
 def get_my_applications():
     """Get all applications submitted by the current user"""
-    db = get_db()
-    applications_collection = db.applications
+    applications_collection = get_collection('applications')
     
     try:
         # Users can only view their own applications
         if g.current_user_role == 'user':
-            applications = list(applications_collection.find({"applicant_id": g.current_user_id}))
+            applications = applications_collection.find({"applicant_id": g.current_user_id}, batch_size=STREAM_BATCH_SIZE)
         # Admins can view all applications, recruiters can view applications for their jobs
         elif g.current_user_role == 'admin':
-            applications = list(applications_collection.find({}))
+            applications = applications_collection.find({}, batch_size=STREAM_BATCH_SIZE)
         elif g.current_user_role == 'recruiter':
-            # Get jobs posted by this recruiter
-            jobs_collection = db.jobs
-            my_jobs = jobs_collection.find({"posted_by": g.current_user_id})
-            my_job_ids = [ObjectId(str(job['_id'])) for job in my_jobs]
-            applications = list(applications_collection.find({
-                "job_id": {"$in": my_job_ids}
-            }))
+            # Join this recruiter's jobs to their applications server-side in one round-trip
+            applications = get_collection('jobs').aggregate([
+                {"$match": {"posted_by": g.current_user_id}},
+                {"$lookup": {
+                    "from": "applications",
+                    "localField": "_id",
+                    "foreignField": "job_id",
+                    "as": "applications"
+                }},
+                {"$unwind": "$applications"},
+                {"$replaceRoot": {"newRoot": "$applications"}}
+            ], batchSize=STREAM_BATCH_SIZE)
         else:
             applications = []
         
-        return make_response(jsonify({
-            "applications": [serialize_doc(app) for app in applications],
-            "count": len(applications)
-        }), 200)
+        return _json_stream(applications, "applications")
         
-    except Exception as e:
-        return make_response(jsonify({"error": str(e)}), 500)
+    except PyMongoError as e:
+        return _json_response({"error": str(e)}, 500)
 
 
 # --- Members API Endpoint ---
@@ -357,20 +455,16 @@ def get_my_applications():
 @roles_required('admin')
 def get_members():
     """Retrieve gym member details (Admin only)"""
-    db = get_db()
-    members_collection = db.members
+    members_collection = get_collection('members')
     
     try:
         # Get all members
-        members = list(members_collection.find({}))
+        members = members_collection.find({}, batch_size=STREAM_BATCH_SIZE)
         
-        return make_response(jsonify({
-            "members": [serialize_doc(member) for member in members],
-            "count": len(members)
-        }), 200)
+        return _json_stream(members, "members")
         
-    except Exception as e:
-        return make_response(jsonify({"error": str(e)}), 500)
+    except PyMongoError as e:
+        return _json_response({"error": str(e)}, 500)
 
 
 if __name__ == "__main__":
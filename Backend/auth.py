@@ -1,25 +1,144 @@
+import base64
+import hashlib
+import hmac
+import time
 import jwt
+import orjson
 from flask import request, jsonify, make_response, current_app, g
-from functools import wraps
+from functools import lru_cache, wraps
+from threading import Lock
 from bson import ObjectId
+from bson.errors import InvalidId
+from cachetools import TTLCache
+from pymongo.errors import DuplicateKeyError
 import bcrypt
 from datetime import datetime, timedelta
 
-from db import get_db
+from db import get_collection
+
+try:
+    from gevent import get_hub
+    from gevent.monkey import is_module_patched
+except ImportError:  # gevent is optional and only used with gevent workers
+    get_hub = None
+
+# Tokens are only ever signed with HS256; built once instead of per request
+JWT_ALGORITHM = "HS256"
+_JWT_ALGORITHMS = (JWT_ALGORITHM,)
+_JWT_DECODE_OPTIONS = {"require": ["exp", "user_id"]}
+
+# Base64url header PyJWT writes for HS256, i.e. on every token /auth/login issues
+_HS256_HEADER = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+# Claims PyJWT validates besides exp; tokens carrying any of them go through PyJWT
+_PYJWT_CLAIMS = frozenset(("iat", "nbf", "aud"))
+
+# One permission bit per role. roles_required folds its roles into a mask once, at
+# decoration time, so each request does a single AND; unknown roles hold no bits
+_ROLE_BITS = {"admin": 1, "recruiter": 2, "user": 4}
+
+# Lowest cost bcrypt accepts
+_TESTING_BCRYPT_ROUNDS = 4
+
+# user_id -> role, so token_required reads each user from MongoDB at most once a minute.
+# Ids with no user are cached as _NO_USER; only a signed token can name one
+_user_roles = TTLCache(maxsize=10_000, ttl=60)
+_user_roles_lock = Lock()
+_NO_USER = object()
+
+# sha256(token) -> verified claims, so a token reused across requests is verified
+# at most once a minute. The digest keeps raw tokens out of memory
+_token_claims = TTLCache(maxsize=10_000, ttl=60)
+_token_claims_lock = Lock()
+
+def _run_blocking(func, *args):
+    """
+    Runs a CPU-bound call on gevent's native thread pool when the process is
+    monkey-patched, so the hub keeps serving other requests meanwhile.
+    Threaded workers call it directly: bcrypt already releases the GIL.
+    """
+    if get_hub is not None and is_module_patched('threading'):
+        return get_hub().threadpool.apply(func, args)
+    return func(*args)
+
+def _b64decode(segment):
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+def _verify_hs256(token, secret):
+    """
+    Verifies a token with the standard HS256 header using one HMAC and one orjson
+    parse, raising the same errors PyJWT would. Returns None for any token it
+    doesn't fully understand, so the caller can hand it to PyJWT instead.
+    """
+    if token.count(b".") != 2:
+        return None
+    signing_input, _, signature = token.rpartition(b".")
+    header, _, payload = signing_input.partition(b".")
+    if header != _HS256_HEADER:
+        return None
+    try:
+        signature = _b64decode(signature)
+        claims = orjson.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict) or not _PYJWT_CLAIMS.isdisjoint(claims):
+        return None
+    if type(claims.get("exp")) is not int or claims.get("user_id") is None:
+        return None
+
+    expected = hmac.new(secret, signing_input, hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+    if claims["exp"] <= int(time.time()):
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    return claims
+
+def _decode_token(token):
+    """
+    Returns the verified claims of a token, reusing a recent verification of the
+    same token. Only tokens that verified are cached, and expiry is rechecked on every call.
+    """
+    raw_token = token.encode('utf-8')
+    key = hashlib.sha256(raw_token).digest()
+    with _token_claims_lock:
+        claims = _token_claims.get(key)
+    if claims is None or claims['exp'] <= time.time():
+        # An expired token raises ExpiredSignatureError here, as before
+        secret = current_app.config['SECRET_KEY']
+        claims = _verify_hs256(raw_token, secret.encode('utf-8'))
+        if claims is None:
+            claims = jwt.decode(token, secret, algorithms=_JWT_ALGORITHMS,
+                                options=_JWT_DECODE_OPTIONS)
+        with _token_claims_lock:
+            _token_claims[key] = claims
+    return claims
+
+def _bcrypt_rounds():
+    # Test runs use bcrypt's minimum cost; nothing there depends on hashes being expensive
+    if current_app.config.get('TESTING'):
+        return _TESTING_BCRYPT_ROUNDS
+    return current_app.config.get('BCRYPT_ROUNDS', 10)
+
+@lru_cache(maxsize=None)
+def _dummy_password_hash(rounds):
+    """
+    Hash checked in place of a stored one when a login names an unknown email, so that
+    failure costs the same bcrypt check as a wrong password. Built once per cost factor.
+    """
+    return bcrypt.hashpw(b'not-a-password', bcrypt.gensalt(rounds=rounds))
 
 def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    # The cost is stored in each hash, so changing BCRYPT_ROUNDS keeps old hashes valid
+    return _run_blocking(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=_bcrypt_rounds()))
 
 def check_password(hashed_password, user_password):
-    return bcrypt.checkpw(user_password.encode('utf-8'), hashed_password)
+    return _run_blocking(bcrypt.checkpw, user_password.encode('utf-8'), hashed_password)
 
 def setup_auth_routes(app):
 
     @app.route('/auth/register', methods=['POST'])
     def register_user():
         data = request.get_json()
-        db = get_db()
-        users_collection = db.users
+        users_collection = get_collection('users')
 
         if not data or 'email' not in data or 'password' not in data or 'role' not in data:
             return make_response(jsonify({"error": "Missing email, password, or role"}), 400)
@@ -29,10 +148,7 @@ def setup_auth_routes(app):
 
         existing_user = users_collection.find_one({'email': data['email']})
         if existing_user:
-            return make_response(jsonify({
-                "error": "User with this email already exists.",
-                "debug": {"email": data['email']}
-            }), 409)
+            return make_response(jsonify({"error": "User with this email already exists."}), 409)
 
         hashed_password = hash_password(data['password'])
         new_user = {
@@ -41,45 +157,36 @@ def setup_auth_routes(app):
             "role": data['role'],
             "created_at": datetime.utcnow()
         }
-        result = users_collection.insert_one(new_user)
+        try:
+            result = users_collection.insert_one(new_user)
+        except DuplicateKeyError:
+            # Lost a race with a concurrent registration for the same email
+            return make_response(jsonify({"error": "User with this email already exists."}), 409)
         return make_response(jsonify({"message": "User registered successfully", "user_id": str(result.inserted_id)}), 201)
 
     @app.route('/auth/login', methods=['POST'])
     def login():
         data = request.get_json()
-        db = get_db()
-        users_collection = db.users
+        users_collection = get_collection('users')
 
         if not data or 'email' not in data or 'password' not in data:
-            return make_response(jsonify({
-                "error": "Missing 'email' or 'password' in request.",
-                "debug": {"received": list(data.keys()) if data else None}
-            }), 400)
-        
-        user = users_collection.find_one({'email': data['email']})
-        if not user:
-            return make_response(jsonify({
-                "error": "User with that email does not exist.",
-                "debug": {"email": data['email']}
-            }), 401)
+            return make_response(jsonify({"error": "Missing 'email' or 'password' in request."}), 400)
         
-        if not check_password(user['password'], data['password']):
-            return make_response(jsonify({
-                "error": "Password is incorrect.",
-                "debug": {
-                    "hashed_password": str(user['password']),
-                    "password_type": str(type(user['password'])).split("'")[1]
-                }
-            }), 401)
+        # Unknown email and wrong password get the same response and the same bcrypt
+        # check, so neither the body nor the timing reveals which accounts exist
+        user = users_collection.find_one({'email': data['email']}, {'password': 1, 'role': 1})
+        hashed_password = user['password'] if user else _dummy_password_hash(_bcrypt_rounds())
+        if not check_password(hashed_password, data['password']) or not user:
+            return make_response(jsonify({"error": "Invalid email or password."}), 401)
 
         try:
             token = jwt.encode({
                 'user_id': str(user['_id']),
                 'role': user['role'],
                 'exp': datetime.utcnow() + timedelta(minutes=60)
-            }, current_app.config['SECRET_KEY'], algorithm="HS256")
-        except Exception as e:
-            return make_response(jsonify({"error": "Token generation failed.", "exception": str(e)}), 500)
+            }, current_app.config['SECRET_KEY'], algorithm=JWT_ALGORITHM)
+        except Exception:
+            return make_response(jsonify({"error": "Token generation failed."}), 500)
 
         return jsonify({'token': token})
 
@@ -104,18 +211,25 @@ def token_required(f):
             return jsonify({'message': 'Token is missing!'}), 401
 
         try:
-            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
-            db = get_db()
-            current_user = db.users.find_one({'_id': ObjectId(data['user_id'])})
-            if not current_user:
+            data = _decode_token(token)
+            user_id = data['user_id']
+            with _user_roles_lock:
+                role = _user_roles.get(user_id)
+            if role is None:
+                current_user = get_collection('users').find_one({'_id': ObjectId(user_id)}, {'role': 1})
+                role = current_user['role'] if current_user else _NO_USER
+                with _user_roles_lock:
+                    _user_roles[user_id] = role
+            if role is _NO_USER:
                 return jsonify({'message': 'User not found!'}), 401
             # Pass user role and id for permission checks
-            g.current_user_id = str(current_user['_id'])
-            g.current_user_role = current_user['role']
+            g.current_user_id = user_id
+            g.current_user_role = role
+            g.current_user_perms = _ROLE_BITS.get(role, 0)
 
         except jwt.ExpiredSignatureError:
             return jsonify({'message': 'Token has expired!'}), 401
-        except jwt.InvalidTokenError:
+        except (jwt.InvalidTokenError, InvalidId):
             return jsonify({'message': 'Token is invalid!'}), 401
 
         return f(*args, **kwargs)
@@ -123,10 +237,14 @@ def token_required(f):
 
 # Decorator for role-based access
 def roles_required(*roles):
+    allowed = 0
+    for role in roles:
+        allowed |= _ROLE_BITS[role]
+
     def wrapper(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            if g.current_user_role not in roles:
+            if not g.current_user_perms & allowed:
                 return jsonify({'message': 'You do not have permission to perform this action'}), 403
             return f(*args, **kwargs)
         return decorated_function
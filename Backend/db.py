@@ -1,23 +1,92 @@
-from flask import current_app, g
-from pymongo import MongoClient
+from threading import Lock
+from flask import current_app
+from pymongo import MongoClient, UpdateOne, WriteConcern
+
+try:
+    import mongomock
+except ImportError:  # mongomock is a test dependency, only needed for mongomock:// URIs
+    mongomock = None
+
+MONGOMOCK_SCHEME = 'mongomock://'
+
+# One client per process: MongoClient owns the connection pool and topology monitoring.
+# It is created on first use so gunicorn workers each build their own after forking.
+_client = None
+_client_lock = Lock()
+
+# Accounts and listings are acknowledged by a majority so they survive a failover;
+# applications only wait for the primary, which keeps the apply endpoint fast
+_WRITE_CONCERNS = {
+    'users': WriteConcern(w='majority'),
+    'jobs': WriteConcern(w='majority'),
+    'applications': WriteConcern(w=1, j=False),
+}
+
+# Job fields GET /jobs filters on, and the lowercased copies stored next to them. Filters
+# prefix-match the copies case-sensitively, which MongoDB answers from a bounded index range
+SEARCH_KEYS = {'title': 'title_lc', 'location': 'location_lc'}
+
+def search_keys(fields):
+    """
+    Returns the lowercased search copies for the filterable fields present in `fields`
+    """
+    return {
+        key: fields[field].lower() if isinstance(fields[field], str) else None
+        for field, key in SEARCH_KEYS.items() if field in fields
+    }
+
+def backfill_search_keys(db):
+    """
+    Adds the search copies to jobs stored before they existed. Safe to call repeatedly.
+    """
+    missing = db.jobs.find(
+        {'$or': [{key: {'$exists': False}} for key in SEARCH_KEYS.values()]},
+        dict.fromkeys(SEARCH_KEYS, 1)
+    )
+    updates = [UpdateOne({'_id': job['_id']}, {'$set': search_keys(job)}) for job in missing]
+    if updates:
+        db.jobs.bulk_write(updates, ordered=False)
+
+def ensure_indexes(db):
+    """
+    Creates the indexes backing the hot query paths. Safe to call repeatedly.
+    Runs at startup from gunicorn.conf.py and from scripts/create_indexes.py, never on
+    the request path: a unique index can fail to build over existing duplicates.
+    """
+    db.jobs.create_index([('title_lc', 1)])
+    db.jobs.create_index([('work_type', 1), ('location_lc', 1)])
+    # Location-only filters can't use the compound index above, which leads with work_type
+    db.jobs.create_index([('location_lc', 1)])
+    db.jobs.create_index([('posted_by', 1)])
+    db.applications.create_index([('job_id', 1), ('applicant_id', 1)], unique=True)
+    db.applications.create_index([('applicant_id', 1)])
+    db.users.create_index([('email', 1)], unique=True)
+
+def get_client():
+    """
+    Returns the process-wide MongoClient, creating it on first use
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Get the MongoDB URI from the application configuration
+                uri = current_app.config['MONGO_URI']
+                if uri.startswith(MONGOMOCK_SCHEME):
+                    # In-process, in-memory database for tests
+                    _client = mongomock.MongoClient()
+                else:
+                    _client = MongoClient(uri)
+    return _client
 
 def get_db():
     """
     Configuration method to return db instance
     """
-    if 'db' not in g:
-        # Get the MongoDB URI from the application configuration
-        mongo_uri = current_app.config['MONGO_URI']
-        g.db = MongoClient(mongo_uri)[current_app.config['DB_NAME']]
-    return g.db
+    return get_client()[current_app.config['DB_NAME']]
 
-def close_db(e=None):
+def get_collection(name):
     """
-    Closes the database again at the end of the request.
+    Returns a collection of the current db with its configured write concern
     """
-    db = g.pop('db', None)
-    if db is not None:
-        # By standard, PyMongo's client manages connections in the background.
-        # This function is here for conceptual completion and can be extended
-        # if specific cleanup is needed.
-        pass
+    return get_db().get_collection(name, write_concern=_WRITE_CONCERNS.get(name))
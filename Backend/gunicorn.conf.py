@@ -0,0 +1,25 @@
+import multiprocessing
+import os
+
+# Every request blocks on MongoDB or bcrypt, both of which release the GIL,
+# so threaded workers let one process serve many in-flight requests.
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5002')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = os.environ.get('WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('WORKER_THREADS', '8'))
+
+
+def on_starting(server):
+    """
+    Builds the MongoDB indexes before any worker starts. The unique ones are what reject
+    duplicate registrations and applications, so if they can't be built gunicorn exits.
+    """
+    from pymongo import MongoClient
+    from app import app
+    from db import backfill_search_keys, ensure_indexes
+
+    # A short-lived client, so workers don't inherit a connection pool across the fork
+    with MongoClient(app.config['MONGO_URI']) as client:
+        db = client[app.config['DB_NAME']]
+        backfill_search_keys(db)
+        ensure_indexes(db)
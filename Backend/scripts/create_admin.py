@@ -9,7 +9,7 @@ sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
 
 # Reuse the existing Flask app configuration and DB helper
 from app import app
-from db import get_db
+from db import get_collection
 from auth import hash_password
 
 
@@ -19,8 +19,7 @@ ADMIN_PASSWORD = "Nepal123"
 
 def ensure_admin_user() -> None:
     with app.app_context():
-        db = get_db()
-        users = db.users
+        users = get_collection("users")
 
         existing = users.find_one({"email": ADMIN_EMAIL})
         if existing:
@@ -0,0 +1,25 @@
+import sys
+import pathlib
+
+# Ensure project root is on sys.path so we can import app, db when executed from scripts/
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+# Reuse the existing Flask app configuration and DB helper
+from app import app
+from db import get_db, ensure_indexes, backfill_search_keys
+
+
+def create_indexes() -> None:
+    with app.app_context():
+        db = get_db()
+        backfill_search_keys(db)
+        ensure_indexes(db)
+        print(f"Indexes ensured on database: {db.name}")
+
+
+if __name__ == "__main__":
+    try:
+        create_indexes()
+    except Exception as e:
+        print(f"Failed to create indexes: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -1,85 +1,272 @@
+import os
+import hashlib
+import logging
 import pytest
-import json
-from app import app
-from db import get_db
-from auth import hash_password
+from contextlib import contextmanager
+import jwt
+import auth
+from app import app, _jobs_query
+from db import get_db, ensure_indexes, backfill_search_keys, search_keys, SEARCH_KEYS
+from auth import hash_password as bcrypt_hash_password, check_password as bcrypt_check_password
 from bson import ObjectId
-from datetime import datetime
+from pymongo.errors import BulkWriteError, PyMongoError
+from datetime import datetime, timedelta
 
 
-@pytest.fixture
-def client():
-    """Test client fixture"""
+# One database per xdist worker (`pytest -n auto`) so parallel runs don't share state;
+# each worker seeds and drops its own. Serial runs use 'master', like xdist's own naming
+TEST_DB_NAME = f"roc_gym_test_db_{os.environ.get('PYTEST_XDIST_WORKER', 'master')}"
+
+# Ids of jobs owned by module- or class-scoped fixtures, kept by the per-test cleanup
+_shared_job_ids = set()
+
+
+# Set TEST_REAL_MONGO=1 to run against the server at MONGO_URI instead of an in-memory mock
+REAL_MONGO = bool(os.environ.get('TEST_REAL_MONGO'))
+
+# Tests that need behaviour mongomock does not emulate, such as query plans
+realmongo = pytest.mark.skipif(not REAL_MONGO, reason='needs a MongoDB server (TEST_REAL_MONGO=1)')
+
+
+@pytest.fixture(scope="session", name="app")
+def _app():
+    """The Flask app, configured once for testing"""
     app.config['TESTING'] = True
-    app.config['DB_NAME'] = 'roc_gym_test_db'
+    app.config['DB_NAME'] = TEST_DB_NAME
+    # Error responses are asserted on, not read from logs
+    app.logger.setLevel(logging.CRITICAL)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    if not REAL_MONGO:
+        app.config['MONGO_URI'] = 'mongomock://localhost'
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Test client fixture, shared by the whole session"""
     with app.test_client() as client:
         yield client
-    # Cleanup test database
-    with app.app_context():
-        db = get_db()
-        db.client.drop_database('roc_gym_test_db')
 
 
-@pytest.fixture
-def admin_token(client):
-    """Create admin user and return token"""
+@pytest.fixture(scope="session")
+def test_db(client):
+    """The test database, looked up and indexed once; collections are used without an app context"""
     with app.app_context():
-        db = get_db()
-        users = db.users
-        users.delete_many({})
-        users.insert_one({
-            'email': 'admin@test.com',
-            'password': hash_password('password'),
-            'role': 'admin',
-            'created_at': datetime.utcnow()
-        })
-    
-    response = client.post('/auth/login',
-                          data=json.dumps({'email': 'admin@test.com', 'password': 'password'}),
-                          content_type='application/json')
-    return json.loads(response.data)['token']
+        test_db = get_db()
+    # The unique indexes back the duplicate-registration and duplicate-application tests
+    ensure_indexes(test_db)
+    return test_db
 
 
-@pytest.fixture
-def recruiter_token(client):
-    """Create recruiter user and return token"""
-    with app.app_context():
-        db = get_db()
-        users = db.users
-        # Check if recruiter already exists
-        if not users.find_one({'email': 'recruiter@test.com'}):
-            users.insert_one({
-                'email': 'recruiter@test.com',
-                'password': hash_password('password'),
-                'role': 'recruiter',
-                'created_at': datetime.utcnow()
-            })
-    
-    response = client.post('/auth/login',
-                          data=json.dumps({'email': 'recruiter@test.com', 'password': 'password'}),
-                          content_type='application/json')
-    return json.loads(response.data)['token']
+@pytest.fixture(scope="session", autouse=True)
+def _warm_app(client, test_db):
+    """Send one request before the first test so it doesn't carry the app's first-request setup"""
+    client.get('/health')
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _drop_test_db(test_db):
+    """Drop the whole test database once, after the last test"""
+    yield
+    test_db.client.drop_database(TEST_DB_NAME)
+
+
+# Request bodies shared across tests
+JOB_PAYLOAD = {
+    'title': 'Test Job',
+    'description': 'Test',
+    'location': 'Test',
+    'work_type': 'Full-time'
+}
+APPLY_PAYLOAD = {
+    'full_name': 'Test User',
+    'email': 'test@test.com',
+    'resume_url': 'http://test.com/resume.pdf'
+}
+UPDATE_PAYLOAD = {'title': 'Updated'}
+
+# Key the app verifies tokens with; tests never change it
+_SECRET_KEY = app.config['SECRET_KEY']
+
+# Timestamp for documents inserted directly; no test asserts on it
+_FIXED_TS = datetime(2024, 1, 1)
+
+# Well-formed job ID that matches no job. Fixed, so parametrized test ids agree across xdist workers
+FAKE_ID = 'f' * 24
+
+# MongoDB error code for a unique index violation
+DUPLICATE_KEY = 11000
+
+# Accounts seeded once per session, keyed by role; their tokens stay valid for every test
+SEED_USERS = {
+    'admin': 'admin@test.com',
+    'recruiter': 'recruiter@test.com',
+    'user': 'user@test.com',
+}
+
+
+@pytest.fixture(autouse=True)
+def _clean_db(test_db):
+    """Empty the test collections before each test; unlike dropping, this keeps the indexes"""
+    # Keep the seeded accounts so the session-scoped tokens remain valid
+    test_db.users.delete_many({'email': {'$nin': list(SEED_USERS.values())}})
+    # Keep the jobs that module- and class-scoped fixtures share across tests
+    test_db.jobs.delete_many({'_id': {'$nin': list(_shared_job_ids)}})
+    test_db.applications.delete_many({})
+
+
+def _fast_hash_password(password):
+    return 'sha256:' + hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+
+def _fast_check_password(hashed_password, user_password):
+    return hashed_password == _fast_hash_password(user_password)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_hash():
+    """Swap bcrypt for SHA-256: these tests check routing and permissions, not hashing cost"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth, 'hash_password', _fast_hash_password)
+        mp.setattr(auth, 'check_password', _fast_check_password)
+        yield
+
+
+@pytest.fixture(scope="session")
+def _seed_users(test_db, _fast_hash):
+    """Insert the admin, recruiter and user accounts once per session; returns their ids by role"""
+    try:
+        test_db.users.insert_many([{
+            'email': email,
+            'password': auth.hash_password('password'),
+            'role': role,
+            'created_at': _FIXED_TS
+        } for role, email in SEED_USERS.items()], ordered=False)
+    except BulkWriteError as e:
+        # Accounts left behind by an interrupted run are fine; anything else is not
+        if any(error['code'] != DUPLICATE_KEY for error in e.details['writeErrors']):
+            raise
+    seeded = test_db.users.find({'email': {'$in': list(SEED_USERS.values())}}, {'role': 1})
+    return {user['role']: str(user['_id']) for user in seeded}
+
+
+def _seed_job(test_db, posted_by, payload=JOB_PAYLOAD):
+    """Insert a job directly, shaped like POST /jobs stores it, for tests where posting is setup"""
+    result = test_db.jobs.insert_one({
+        'company_name': 'ROC Gym',
+        'salary_range': '',
+        'requirements': '',
+        **payload,
+        **search_keys(payload),
+        'views': 0,
+        'date_posted': _FIXED_TS,
+        'posted_by': posted_by
+    })
+    return str(result.inserted_id)
+
+
+def _seed_application(test_db, job_id, applicant_id):
+    """Insert an application directly, for tests where applying is setup rather than the subject"""
+    test_db.applications.insert_one({
+        'job_id': ObjectId(job_id),
+        'applicant_id': applicant_id,
+        **APPLY_PAYLOAD,
+        'status': 'pending',
+        'applied_at': _FIXED_TS
+    })
+
+
+def _sign_token(user_id, role, expires_in=timedelta(hours=1)):
+    """Sign a token the way /auth/login does, without the password check"""
+    return jwt.encode({
+        'user_id': user_id,
+        'role': role,
+        'exp': datetime.utcnow() + expires_in
+    }, _SECRET_KEY, algorithm=auth.JWT_ALGORITHM)
+
+
+# Tokens for the auth edge cases, signed once at import: one already expired, one for a
+# user id that is never inserted
+_EXPIRED_TOKEN = _sign_token('test_user_id', 'admin', expires_in=timedelta(hours=-1))
+_FAKE_USER_TOKEN = _sign_token(str(ObjectId()), 'admin')
+
+
+@pytest.fixture(scope="session")
+def admin_token(_seed_users):
+    """Token for the seeded admin, signed once per session"""
+    return _sign_token(_seed_users['admin'], 'admin')
+
+
+@pytest.fixture(scope="session")
+def recruiter_token(_seed_users):
+    """Token for the seeded recruiter, signed once per session"""
+    return _sign_token(_seed_users['recruiter'], 'recruiter')
+
+
+@pytest.fixture(scope="session")
+def user_token(_seed_users):
+    """Token for the seeded regular user, signed once per session"""
+    return _sign_token(_seed_users['user'], 'user')
+
+
+def _bearer(token):
+    """Authorization header for a one-off token; the seeded roles use the clients below"""
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _authed_client(token):
+    """Separate test client that sends the bearer token on every request"""
+    # Auth travels in the header, so skip the cookie jar bookkeeping on every request
+    authed = app.test_client(use_cookies=False)
+    authed.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return authed
+
+
+@pytest.fixture(scope="session")
+def admin_client(admin_token):
+    """Test client authenticated as the seeded admin"""
+    return _authed_client(admin_token)
+
+
+@pytest.fixture(scope="session")
+def recruiter_client(recruiter_token):
+    """Test client authenticated as the seeded recruiter"""
+    return _authed_client(recruiter_token)
+
+
+@pytest.fixture(scope="session")
+def user_client(user_token):
+    """Test client authenticated as the seeded regular user"""
+    return _authed_client(user_token)
+
+
+def _post_job(test_client, payload=JOB_PAYLOAD, **kwargs):
+    return test_client.post('/jobs', json=payload, **kwargs)
+
+
+@contextmanager
+def _shared_jobs(test_db, posted_by, *payloads):
+    """Seed jobs that survive the per-test cleanup until the block exits"""
+    job_ids = [_seed_job(test_db, posted_by, payload) for payload in payloads]
+    oids = {ObjectId(job_id) for job_id in job_ids}
+    _shared_job_ids.update(oids)
+    try:
+        yield job_ids
+    finally:
+        _shared_job_ids.difference_update(oids)
+
+
+@pytest.fixture(scope="module")
+def sample_job_id(test_db, _seed_users):
+    """Admin-posted job shared by the tests in a module that only read or apply to it"""
+    with _shared_jobs(test_db, _seed_users['admin'], JOB_PAYLOAD) as (job_id,):
+        yield job_id
 
 
 @pytest.fixture
-def user_token(client):
-    """Create regular user and return token"""
-    with app.app_context():
-        db = get_db()
-        users = db.users
-        # Check if user already exists
-        if not users.find_one({'email': 'user@test.com'}):
-            users.insert_one({
-                'email': 'user@test.com',
-                'password': hash_password('password'),
-                'role': 'user',
-                'created_at': datetime.utcnow()
-            })
-    
-    response = client.post('/auth/login',
-                          data=json.dumps({'email': 'user@test.com', 'password': 'password'}),
-                          content_type='application/json')
-    return json.loads(response.data)['token']
+def fresh_job_id(test_db, _seed_users):
+    """Admin-posted job for a single test that modifies it or checks its view count"""
+    return _seed_job(test_db, _seed_users['admin'])
 
 
 class TestPublicEndpoints:
@@ -88,424 +275,289 @@ class TestPublicEndpoints:
     def test_home(self, client):
         response = client.get('/')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['company'] == 'ROC Gym'
         assert 'endpoints' in data
     
     def test_health_check(self, client):
         response = client.get('/health')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['status'] == 'healthy'
         assert data['database'] == 'connected'
     
     def test_get_jobs_empty(self, client):
         response = client.get('/jobs')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert isinstance(data, list)
 
 
+class TestPasswordHashing:
+    """Test the real bcrypt helpers the rest of the suite swaps out"""
+    
+    def test_hash_and_check_password(self):
+        with app.app_context():
+            hashed = bcrypt_hash_password('password')
+        # TESTING hashes at bcrypt's minimum cost
+        assert hashed.startswith(b'$2b$04$')
+        assert bcrypt_check_password(hashed, 'password')
+        assert not bcrypt_check_password(hashed, 'wrongpassword')
+
+
 class TestAuthentication:
     """Test authentication endpoints"""
     
     def test_register_user(self, client):
         response = client.post('/auth/register',
-                              data=json.dumps({
+                              json={
                                   'email': 'newuser@test.com',
                                   'password': 'password123',
                                   'role': 'user'
-                              }),
-                              content_type='application/json')
+                              })
         assert response.status_code == 201
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'user_id' in data
     
-    def test_register_duplicate_email(self, client, admin_token):
+    def test_register_duplicate_email(self, client, _seed_users):
         response = client.post('/auth/register',
-                              data=json.dumps({
+                              json={
                                   'email': 'admin@test.com',
                                   'password': 'password123',
                                   'role': 'user'
-                              }),
-                              content_type='application/json')
+                              })
         assert response.status_code == 409
     
     def test_register_invalid_role(self, client):
         response = client.post('/auth/register',
-                              data=json.dumps({
+                              json={
                                   'email': 'invalid@test.com',
                                   'password': 'password123',
                                   'role': 'invalid_role'
-                              }),
-                              content_type='application/json')
+                              })
         assert response.status_code == 400
     
-    def test_login_success(self, client, admin_token):
+    def test_login_success(self, client, _seed_users):
         response = client.post('/auth/login',
-                              data=json.dumps({
+                              json={
                                   'email': 'admin@test.com',
                                   'password': 'password'
-                              }),
-                              content_type='application/json')
+                              })
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'token' in data
     
-    def test_login_wrong_password(self, client, admin_token):
+    def test_login_wrong_password(self, client, _seed_users):
         response = client.post('/auth/login',
-                              data=json.dumps({
+                              json={
                                   'email': 'admin@test.com',
                                   'password': 'wrongpassword'
-                              }),
-                              content_type='application/json')
+                              })
         assert response.status_code == 401
     
     def test_login_nonexistent_user(self, client):
         response = client.post('/auth/login',
-                              data=json.dumps({
+                              json={
+                                  'email': 'nonexistent@test.com',
+                                  'password': 'password'
+                              })
+        assert response.status_code == 401
+
+    def test_login_nonexistent_user_checks_a_hash(self, client, monkeypatch):
+        """An unknown email still costs one password check, so timing doesn't reveal it"""
+        checked = []
+        monkeypatch.setattr(auth, 'check_password', lambda hashed, password: checked.append(hashed))
+        response = client.post('/auth/login',
+                              json={
                                   'email': 'nonexistent@test.com',
                                   'password': 'password'
-                              }),
-                              content_type='application/json')
+                              })
         assert response.status_code == 401
+        assert checked == [auth._dummy_password_hash(auth._TESTING_BCRYPT_ROUNDS)]
+
+    def test_dummy_hash_uses_configured_rounds(self, monkeypatch):
+        """The dummy hash costs as much as the real ones, e.g. with BCRYPT_ROUNDS from .env"""
+        monkeypatch.setitem(app.config, 'TESTING', False)
+        monkeypatch.setitem(app.config, 'BCRYPT_ROUNDS', 5)
+        with app.app_context():
+            assert auth._dummy_password_hash(auth._bcrypt_rounds()).startswith(b'$2b$05$')
     
-    def test_logout(self, client, user_token):
-        response = client.post('/auth/logout',
-                              headers={'Authorization': f'Bearer {user_token}'})
+    def test_logout(self, user_client):
+        response = user_client.post('/auth/logout')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'logged out' in data['message'].lower()
 
 
 class TestJobManagement:
     """Test job management endpoints"""
     
-    def test_create_job_as_admin(self, client, admin_token):
-        response = client.post('/jobs',
-                              data=json.dumps({
-                                  'title': 'Fitness Trainer',
-                                  'description': 'Test job',
-                                  'location': 'Downtown',
-                                  'work_type': 'Full-time',
-                                  'salary_range': '30000-45000',
-                                  'requirements': 'CPR certified'
-                              }),
-                              headers={'Authorization': f'Bearer {admin_token}'},
-                              content_type='application/json')
+    def test_create_job_as_admin(self, admin_client):
+        response = _post_job(admin_client, {
+            'title': 'Fitness Trainer',
+            'description': 'Test job',
+            'location': 'Downtown',
+            'work_type': 'Full-time',
+            'salary_range': '30000-45000',
+            'requirements': 'CPR certified'
+        })
         assert response.status_code == 201
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['title'] == 'Fitness Trainer'
+        assert 'title_lc' not in data
         assert data['company_name'] == 'ROC Gym'
         assert data['views'] == 0
     
-    def test_create_job_as_recruiter(self, client, recruiter_token):
-        response = client.post('/jobs',
-                              data=json.dumps({
-                                  'title': 'Front Desk Executive',
-                                  'description': 'Test job',
-                                  'location': 'Central',
-                                  'work_type': 'Part-time'
-                              }),
-                              headers={'Authorization': f'Bearer {recruiter_token}'},
-                              content_type='application/json')
+    def test_create_job_as_recruiter(self, recruiter_client):
+        response = _post_job(recruiter_client, {
+            'title': 'Front Desk Executive',
+            'description': 'Test job',
+            'location': 'Central',
+            'work_type': 'Part-time'
+        })
         assert response.status_code == 201
     
-    def test_create_job_as_user_forbidden(self, client, user_token):
-        response = client.post('/jobs',
-                              data=json.dumps({
-                                  'title': 'Test Job',
-                                  'description': 'Test',
-                                  'location': 'Test',
-                                  'work_type': 'Full-time'
-                              }),
-                              headers={'Authorization': f'Bearer {user_token}'},
-                              content_type='application/json')
+    def test_create_job_as_user_forbidden(self, user_client):
+        response = _post_job(user_client)
         assert response.status_code == 403
     
-    def test_create_job_missing_fields(self, client, admin_token):
-        response = client.post('/jobs',
-                              data=json.dumps({
-                                  'title': 'Test Job'
-                              }),
-                              headers={'Authorization': f'Bearer {admin_token}'},
-                              content_type='application/json')
+    def test_create_job_missing_fields(self, admin_client):
+        response = _post_job(admin_client, {
+            'title': 'Test Job'
+        })
         assert response.status_code == 400
     
-    def test_get_all_jobs(self, client, admin_token):
-        # Create a job first
-        client.post('/jobs',
-                   data=json.dumps({
-                       'title': 'Fitness Trainer',
-                       'description': 'Test',
-                       'location': 'Downtown',
-                       'work_type': 'Full-time'
-                   }),
-                   headers={'Authorization': f'Bearer {admin_token}'},
-                   content_type='application/json')
-        
+    def test_get_all_jobs(self, client, sample_job_id):
         response = client.get('/jobs')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert len(data) > 0
     
-    def test_get_job_by_id(self, client, admin_token):
-        # Create a job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
+    def test_get_job_by_id(self, client, fresh_job_id):
         # Get the job
-        response = client.get(f'/jobs/{job_id}')
+        response = client.get(f'/jobs/{fresh_job_id}')
         assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['_id'] == job_id
+        data = response.get_json()
+        assert data['_id'] == fresh_job_id
         assert data['views'] == 1
+        assert 'title_lc' not in data
     
-    def test_get_job_invalid_id(self, client):
-        response = client.get('/jobs/invalid_id')
-        assert response.status_code == 400
-    
-    def test_get_job_not_found(self, client):
-        fake_id = str(ObjectId())
-        response = client.get(f'/jobs/{fake_id}')
-        assert response.status_code == 404
-    
-    def test_update_job_as_admin(self, client, admin_token):
-        # Create a job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Original Title',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
+    def test_update_job_as_admin(self, fresh_job_id, admin_client):
         # Update the job
-        response = client.put(f'/jobs/{job_id}',
-                             data=json.dumps({'title': 'Updated Title'}),
-                             headers={'Authorization': f'Bearer {admin_token}'},
-                             content_type='application/json')
+        response = admin_client.put(f'/jobs/{fresh_job_id}',
+                                   json={'title': 'Updated Title'})
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['title'] == 'Updated Title'
-    
-    def test_update_job_recruiter_own(self, client, recruiter_token):
+
+    def test_update_job_title_is_searchable(self, fresh_job_id, admin_client, client):
+        response = admin_client.put(f'/jobs/{fresh_job_id}',
+                                   json={'title': 'Yoga Instructor', 'title_lc': 'stale'})
+        assert response.status_code == 200
+        assert 'title_lc' not in response.get_json()
+        data = client.get('/jobs?title=yoga').get_json()
+        assert [job['_id'] for job in data] == [fresh_job_id]
+
+    def test_backfill_search_keys(self, client, test_db, _seed_users):
+        """Jobs stored before the search copies existed become searchable after the backfill"""
+        test_db.jobs.insert_one({**JOB_PAYLOAD, 'title': 'Pilates Coach', 'posted_by': _seed_users['admin']})
+        assert client.get('/jobs?title=pilates').get_json() == []
+        backfill_search_keys(test_db)
+        data = client.get('/jobs?title=pilates').get_json()
+        assert [job['title'] for job in data] == ['Pilates Coach']
+    
+    def test_update_job_recruiter_own(self, recruiter_client, test_db, _seed_users):
         # Create job as recruiter
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Original',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {recruiter_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
+        job_id = _seed_job(test_db, _seed_users['recruiter'])
         
         # Update own job
-        response = client.put(f'/jobs/{job_id}',
-                             data=json.dumps({'title': 'Updated'}),
-                             headers={'Authorization': f'Bearer {recruiter_token}'},
-                             content_type='application/json')
+        response = recruiter_client.put(f'/jobs/{job_id}',
+                                       json=UPDATE_PAYLOAD)
         assert response.status_code == 200
     
-    def test_delete_job_as_admin(self, client, admin_token):
-        # Create a job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'To Delete',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
+    def test_delete_job_as_admin(self, fresh_job_id, admin_client):
         # Delete the job
-        response = client.delete(f'/jobs/{job_id}',
-                                headers={'Authorization': f'Bearer {admin_token}'})
+        response = admin_client.delete(f'/jobs/{fresh_job_id}')
         assert response.status_code == 200
 
 
 class TestJobApplications:
     """Test job application endpoints"""
     
-    def test_apply_for_job(self, client, admin_token, user_token):
-        # Create a job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
-        # Apply for job
-        response = client.post(f'/jobs/{job_id}/apply',
-                              data=json.dumps({
-                                  'full_name': 'Test User',
-                                  'email': 'test@test.com',
-                                  'resume_url': 'http://test.com/resume.pdf'
-                              }),
-                              headers={'Authorization': f'Bearer {user_token}'},
-                              content_type='application/json')
+    def test_apply_for_job(self, sample_job_id, user_client):
+        response = user_client.post(f'/jobs/{sample_job_id}/apply',
+                                   json=APPLY_PAYLOAD)
         assert response.status_code == 201
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'application' in data
     
-    def test_apply_duplicate(self, client, admin_token, user_token):
-        # Create a job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
-        # Apply first time
-        client.post(f'/jobs/{job_id}/apply',
-                   data=json.dumps({
-                       'full_name': 'Test User',
-                       'email': 'test@test.com',
-                       'resume_url': 'http://test.com/resume.pdf'
-                   }),
-                   headers={'Authorization': f'Bearer {user_token}'},
-                   content_type='application/json')
+    def test_apply_duplicate(self, sample_job_id, user_client, test_db, _seed_users):
+        # Already applied
+        _seed_application(test_db, sample_job_id, _seed_users['user'])
         
-        # Apply second time (should fail)
-        response = client.post(f'/jobs/{job_id}/apply',
-                              data=json.dumps({
-                                  'full_name': 'Test User',
-                                  'email': 'test@test.com',
-                                  'resume_url': 'http://test.com/resume.pdf'
-                              }),
-                              headers={'Authorization': f'Bearer {user_token}'},
-                              content_type='application/json')
+        # Apply again (should fail)
+        response = user_client.post(f'/jobs/{sample_job_id}/apply',
+                                   json=APPLY_PAYLOAD)
         assert response.status_code == 409
     
-    def test_apply_as_admin_forbidden(self, client, admin_token):
-        # Create a job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
+    def test_apply_as_admin_forbidden(self, sample_job_id, admin_client):
         # Try to apply as admin (should fail)
-        response = client.post(f'/jobs/{job_id}/apply',
-                              data=json.dumps({
-                                  'full_name': 'Admin',
-                                  'email': 'admin@test.com',
-                                  'resume_url': 'http://test.com/resume.pdf'
-                              }),
-                              headers={'Authorization': f'Bearer {admin_token}'},
-                              content_type='application/json')
+        response = admin_client.post(f'/jobs/{sample_job_id}/apply',
+                                    json=APPLY_PAYLOAD)
         assert response.status_code == 403
     
-    def test_get_my_applications_as_user(self, client, admin_token, user_token):
-        # Create and apply for a job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
-        client.post(f'/jobs/{job_id}/apply',
-                   data=json.dumps({
-                       'full_name': 'Test User',
-                       'email': 'test@test.com',
-                       'resume_url': 'http://test.com/resume.pdf'
-                   }),
-                   headers={'Authorization': f'Bearer {user_token}'},
-                   content_type='application/json')
+    def test_get_my_applications_as_user(self, sample_job_id, user_client, test_db, _seed_users):
+        _seed_application(test_db, sample_job_id, _seed_users['user'])
         
         # Get applications
-        response = client.get('/applications',
-                             headers={'Authorization': f'Bearer {user_token}'})
+        response = user_client.get('/applications')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['count'] > 0
     
-    def test_get_job_applications_as_admin(self, client, admin_token, user_token):
-        # Create job and application
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
-        client.post(f'/jobs/{job_id}/apply',
-                   data=json.dumps({
-                       'full_name': 'Test User',
-                       'email': 'test@test.com',
-                       'resume_url': 'http://test.com/resume.pdf'
-                   }),
-                   headers={'Authorization': f'Bearer {user_token}'},
-                   content_type='application/json')
+    def test_get_job_applications_as_admin(self, sample_job_id, admin_client, test_db, _seed_users):
+        _seed_application(test_db, sample_job_id, _seed_users['user'])
         
         # Get applications for job
-        response = client.get(f'/jobs/{job_id}/applications',
-                             headers={'Authorization': f'Bearer {admin_token}'})
+        response = admin_client.get(f'/jobs/{sample_job_id}/applications')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['count'] > 0
 
 
 class TestMembers:
     """Test member management"""
     
-    def test_get_members_as_admin(self, client, admin_token):
-        response = client.get('/members',
-                             headers={'Authorization': f'Bearer {admin_token}'})
+    def test_get_members_as_admin(self, admin_client):
+        response = admin_client.get('/members')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'members' in data
         assert 'count' in data
     
-    def test_get_members_as_user_forbidden(self, client, user_token):
-        response = client.get('/members',
-                             headers={'Authorization': f'Bearer {user_token}'})
+    def test_get_members_as_user_forbidden(self, user_client):
+        response = user_client.get('/members')
         assert response.status_code == 403
     
-    def test_get_members_as_recruiter_forbidden(self, client, recruiter_token):
-        response = client.get('/members',
-                             headers={'Authorization': f'Bearer {recruiter_token}'})
+    def test_get_members_as_recruiter_forbidden(self, recruiter_client):
+        response = recruiter_client.get('/members')
         assert response.status_code == 403
 
+    def test_get_members_query_error(self, admin_client, monkeypatch):
+        """A cursor that fails when read gives a 500, not a truncated 200"""
+        def failing_cursor():
+            raise PyMongoError("Query failed")
+            yield
+
+        class MockCollection:
+            def find(self, *args, **kwargs):
+                return failing_cursor()
+
+        monkeypatch.setattr('app.get_collection', lambda name: MockCollection())
+        response = admin_client.get('/members')
+        assert response.status_code == 500
+        assert response.get_json() == {'error': 'Query failed'}
+
 
 class TestEdgeCases:
     """Test edge cases and error handling"""
@@ -518,428 +570,256 @@ class TestEdgeCases:
                     raise Exception("Database connection failed")
             return MockDB()
         
-        with app.app_context():
-            monkeypatch.setattr('app.get_db', mock_get_db)
-            response = client.get('/health')
-            assert response.status_code == 503
-            data = json.loads(response.data)
-            assert data['status'] == 'unhealthy'
-    
-    def test_register_missing_fields(self, client):
-        """Test registration with missing fields"""
-        response = client.post('/auth/register',
-                              data=json.dumps({'email': 'test@test.com'}),
-                              content_type='application/json')
-        assert response.status_code == 400
-    
-    def test_login_missing_fields(self, client):
-        """Test login with missing fields"""
-        response = client.post('/auth/login',
-                              data=json.dumps({'email': 'test@test.com'}),
-                              content_type='application/json')
+        monkeypatch.setattr('app.get_db', mock_get_db)
+        response = client.get('/health')
+        assert response.status_code == 503
+        data = response.get_json()
+        assert data['status'] == 'unhealthy'
+    
+    @pytest.mark.parametrize('path', ['/auth/register', '/auth/login'])
+    def test_auth_missing_fields(self, client, path):
+        """Test registration and login with missing fields"""
+        response = client.post(path,
+                              json={'email': 'test@test.com'})
         assert response.status_code == 400
     
-    def test_apply_job_not_found(self, client, user_token):
-        """Test applying for non-existent job"""
-        fake_id = str(ObjectId())
-        response = client.post(f'/jobs/{fake_id}/apply',
-                              data=json.dumps({
-                                  'full_name': 'Test',
-                                  'email': 'test@test.com',
-                                  'resume_url': 'http://test.com/resume.pdf'
-                              }),
-                              headers={'Authorization': f'Bearer {user_token}'},
-                              content_type='application/json')
-        assert response.status_code == 404
-    
-    def test_apply_missing_fields(self, client, admin_token, user_token):
+    def test_apply_missing_fields(self, sample_job_id, user_client):
         """Test applying with missing required fields"""
-        # Create job first
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
-        # Apply with missing fields
-        response = client.post(f'/jobs/{job_id}/apply',
-                              data=json.dumps({'full_name': 'Test'}),
-                              headers={'Authorization': f'Bearer {user_token}'},
-                              content_type='application/json')
-        assert response.status_code == 400
-    
-    def test_update_job_not_found(self, client, admin_token):
-        """Test updating non-existent job"""
-        fake_id = str(ObjectId())
-        response = client.put(f'/jobs/{fake_id}',
-                             data=json.dumps({'title': 'Updated'}),
-                             headers={'Authorization': f'Bearer {admin_token}'},
-                             content_type='application/json')
-        assert response.status_code == 404
-    
-    def test_update_job_invalid_id(self, client, admin_token):
-        """Test updating with invalid job ID"""
-        response = client.put('/jobs/invalid_id',
-                             data=json.dumps({'title': 'Updated'}),
-                             headers={'Authorization': f'Bearer {admin_token}'},
-                             content_type='application/json')
-        assert response.status_code == 400
-    
-    def test_delete_job_not_found(self, client, admin_token):
-        """Test deleting non-existent job"""
-        fake_id = str(ObjectId())
-        response = client.delete(f'/jobs/{fake_id}',
-                                headers={'Authorization': f'Bearer {admin_token}'})
-        assert response.status_code == 404
-    
-    def test_delete_job_invalid_id(self, client, admin_token):
-        """Test deleting with invalid job ID"""
-        response = client.delete('/jobs/invalid_id',
-                                headers={'Authorization': f'Bearer {admin_token}'})
+        response = user_client.post(f'/jobs/{sample_job_id}/apply',
+                                   json={'full_name': 'Test'})
         assert response.status_code == 400
     
-    def test_get_job_applications_not_found(self, client, admin_token):
-        """Test getting applications for non-existent job"""
-        fake_id = str(ObjectId())
-        response = client.get(f'/jobs/{fake_id}/applications',
-                             headers={'Authorization': f'Bearer {admin_token}'})
-        assert response.status_code == 404
-    
-    def test_get_job_applications_invalid_id(self, client, admin_token):
-        """Test getting applications with invalid job ID"""
-        response = client.get('/jobs/invalid_id/applications',
-                             headers={'Authorization': f'Bearer {admin_token}'})
-        assert response.status_code == 400
-    
-    def test_apply_invalid_job_id(self, client, user_token):
-        """Test applying with invalid job ID"""
-        response = client.post('/jobs/invalid_id/apply',
-                              data=json.dumps({
-                                  'full_name': 'Test',
-                                  'email': 'test@test.com',
-                                  'resume_url': 'http://test.com/resume.pdf'
-                              }),
-                              headers={'Authorization': f'Bearer {user_token}'},
-                              content_type='application/json')
-        assert response.status_code == 400
-    
-    def test_recruiter_view_applications(self, client, recruiter_token, user_token):
+    @pytest.mark.parametrize('client_name, method, path, body, expected', [
+        ('client', 'get', '/jobs/invalid_id', None, 400),
+        ('admin_client', 'put', '/jobs/invalid_id', UPDATE_PAYLOAD, 400),
+        ('admin_client', 'delete', '/jobs/invalid_id', None, 400),
+        ('admin_client', 'get', '/jobs/invalid_id/applications', None, 400),
+        ('user_client', 'post', '/jobs/invalid_id/apply', APPLY_PAYLOAD, 400),
+        ('client', 'get', f'/jobs/{FAKE_ID}', None, 404),
+        ('admin_client', 'put', f'/jobs/{FAKE_ID}', UPDATE_PAYLOAD, 404),
+        ('admin_client', 'delete', f'/jobs/{FAKE_ID}', None, 404),
+        ('admin_client', 'get', f'/jobs/{FAKE_ID}/applications', None, 404),
+        ('user_client', 'post', f'/jobs/{FAKE_ID}/apply', APPLY_PAYLOAD, 404),
+    ])
+    def test_job_not_found_or_invalid(self, request, client_name, method, path, body, expected):
+        """Test every job route with a malformed job ID and with one that matches no job"""
+        test_client = request.getfixturevalue(client_name)
+        response = getattr(test_client, method)(path, json=body)
+        assert response.status_code == expected
+    
+    def test_recruiter_view_applications(self, recruiter_client, test_db, _seed_users):
         """Test recruiter viewing applications for their jobs"""
         # Create job as recruiter
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Recruiter Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {recruiter_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
+        job_id = _seed_job(test_db, _seed_users['recruiter'])
         
         # Apply for job
-        client.post(f'/jobs/{job_id}/apply',
-                   data=json.dumps({
-                       'full_name': 'Test User',
-                       'email': 'test@test.com',
-                       'resume_url': 'http://test.com/resume.pdf'
-                   }),
-                   headers={'Authorization': f'Bearer {user_token}'},
-                   content_type='application/json')
+        _seed_application(test_db, job_id, _seed_users['user'])
         
         # Recruiter views applications
-        response = client.get('/applications',
-                             headers={'Authorization': f'Bearer {recruiter_token}'})
+        response = recruiter_client.get('/applications')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['count'] >= 1
     
-    def test_recruiter_cannot_view_other_job_applications(self, client, admin_token, recruiter_token):
-        """Test recruiter cannot view applications for jobs they didn't post"""
-        # Admin creates job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Admin Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
-        # Recruiter tries to view applications
-        response = client.get(f'/jobs/{job_id}/applications',
-                             headers={'Authorization': f'Bearer {recruiter_token}'})
-        assert response.status_code == 403
-    
-    def test_recruiter_cannot_update_other_jobs(self, client, admin_token, recruiter_token):
-        """Test recruiter cannot update jobs they didn't create"""
-        # Admin creates job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Admin Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
-        # Recruiter tries to update
-        response = client.put(f'/jobs/{job_id}',
-                             data=json.dumps({'title': 'Updated'}),
-                             headers={'Authorization': f'Bearer {recruiter_token}'},
-                             content_type='application/json')
-        assert response.status_code == 403
-    
-    def test_recruiter_cannot_delete_other_jobs(self, client, admin_token, recruiter_token):
-        """Test recruiter cannot delete jobs they didn't create"""
-        # Admin creates job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Admin Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
-        
-        # Recruiter tries to delete
-        response = client.delete(f'/jobs/{job_id}',
-                                headers={'Authorization': f'Bearer {recruiter_token}'})
+    @pytest.mark.parametrize('method, path_suffix, body', [
+        ('get', '/applications', None),
+        ('put', '', UPDATE_PAYLOAD),
+        ('delete', '', None),
+    ])
+    def test_recruiter_forbidden_on_other_jobs(self, recruiter_client, sample_job_id, method, path_suffix, body):
+        """Test recruiter cannot view applications for, update or delete a job they didn't post"""
+        # Every attempt is refused, so the admin's shared job is never changed
+        response = getattr(recruiter_client, method)(f'/jobs/{sample_job_id}{path_suffix}', json=body)
         assert response.status_code == 403
     
     def test_missing_authorization_header(self, client):
         """Test endpoints without authorization header"""
-        response = client.post('/jobs',
-                              data=json.dumps({
-                                  'title': 'Test',
-                                  'description': 'Test',
-                                  'location': 'Test',
-                                  'work_type': 'Full-time'
-                              }),
-                              content_type='application/json')
+        response = _post_job(client)
         assert response.status_code == 401
     
     def test_invalid_token(self, client):
         """Test with invalid token"""
-        response = client.post('/jobs',
-                              data=json.dumps({
-                                  'title': 'Test',
-                                  'description': 'Test',
-                                  'location': 'Test',
-                                  'work_type': 'Full-time'
-                              }),
-                              headers={'Authorization': 'Bearer invalid_token'},
-                              content_type='application/json')
+        response = _post_job(client, headers=_bearer('invalid_token'))
         assert response.status_code == 401
     
-    def test_expired_token(self, client, admin_token):
+    def test_expired_token(self, client):
         """Test with expired token"""
-        import jwt
-        from datetime import datetime, timedelta
-        
-        # Create an expired token
-        with app.app_context():
-            expired_token = jwt.encode({
-                'user_id': 'test_user_id',
-                'role': 'admin',
-                'exp': datetime.utcnow() - timedelta(hours=1)
-            }, app.config['SECRET_KEY'], algorithm="HS256")
-        
-        response = client.post('/jobs',
-                              data=json.dumps({
-                                  'title': 'Test',
-                                  'description': 'Test',
-                                  'location': 'Test',
-                                  'work_type': 'Full-time'
-                              }),
-                              headers={'Authorization': f'Bearer {expired_token}'},
-                              content_type='application/json')
+        response = _post_job(client, headers=_bearer(_EXPIRED_TOKEN))
         assert response.status_code == 401
     
     def test_token_with_nonexistent_user(self, client):
         """Test token with user that doesn't exist in DB"""
-        import jwt
-        from datetime import datetime, timedelta
-        
-        fake_user_id = str(ObjectId())
-        
-        with app.app_context():
-            fake_token = jwt.encode({
-                'user_id': fake_user_id,
-                'role': 'admin',
-                'exp': datetime.utcnow() + timedelta(hours=1)
-            }, app.config['SECRET_KEY'], algorithm="HS256")
+        response = _post_job(client, headers=_bearer(_FAKE_USER_TOKEN))
+        assert response.status_code == 401
+    
+    def test_token_with_wrong_signature(self, client, _seed_users):
+        """Test token for a real user signed with a different key"""
+        forged_token = jwt.encode({
+            'user_id': _seed_users['admin'],
+            'role': 'admin',
+            'exp': datetime.utcnow() + timedelta(hours=1)
+        }, 'not-the-secret-key', algorithm=auth.JWT_ALGORITHM)
         
-        response = client.post('/jobs',
-                              data=json.dumps({
-                                  'title': 'Test',
-                                  'description': 'Test',
-                                  'location': 'Test',
-                                  'work_type': 'Full-time'
-                              }),
-                              headers={'Authorization': f'Bearer {fake_token}'},
-                              content_type='application/json')
+        response = _post_job(client, headers=_bearer(forged_token))
         assert response.status_code == 401
     
-    def test_update_job_no_changes(self, client, admin_token):
-        """Test updating job with same data (no changes)"""
-        # Create a job
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test Job',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
+    def test_token_with_extra_claims(self, client, _seed_users):
+        """Test token with claims the HS256 fast path leaves to PyJWT"""
+        token = jwt.encode({
+            'user_id': _seed_users['admin'],
+            'role': 'admin',
+            'iat': datetime.utcnow(),
+            'exp': datetime.utcnow() + timedelta(hours=1)
+        }, _SECRET_KEY, algorithm=auth.JWT_ALGORITHM)
         
+        response = client.get('/members', headers=_bearer(token))
+        assert response.status_code == 200
+    
+    def test_update_job_no_changes(self, fresh_job_id, admin_client):
+        """Test updating job with same data (no changes)"""
         # Update with same data (should return no changes)
-        response = client.put(f'/jobs/{job_id}',
-                             data=json.dumps({}),
-                             headers={'Authorization': f'Bearer {admin_token}'},
-                             content_type='application/json')
+        response = admin_client.put(f'/jobs/{fresh_job_id}',
+                                   json={})
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         # Could be "No changes made" or the job itself
         assert 'message' in data or 'title' in data
     
-    def test_admin_view_all_applications(self, client, admin_token, user_token):
+    def test_admin_view_all_applications(self, admin_client, test_db, _seed_users):
         """Test admin viewing all applications from all users"""
         # Create job and application
-        create_response = client.post('/jobs',
-                                     data=json.dumps({
-                                         'title': 'Test',
-                                         'description': 'Test',
-                                         'location': 'Test',
-                                         'work_type': 'Full-time'
-                                     }),
-                                     headers={'Authorization': f'Bearer {admin_token}'},
-                                     content_type='application/json')
-        job_id = json.loads(create_response.data)['_id']
+        job_id = _seed_job(test_db, _seed_users['admin'])
         
-        client.post(f'/jobs/{job_id}/apply',
-                   data=json.dumps({
-                       'full_name': 'Test User',
-                       'email': 'test@test.com',
-                       'resume_url': 'http://test.com/resume.pdf'
-                   }),
-                   headers={'Authorization': f'Bearer {user_token}'},
-                   content_type='application/json')
+        _seed_application(test_db, job_id, _seed_users['user'])
         
         # Admin views ALL applications
-        response = client.get('/applications',
-                             headers={'Authorization': f'Bearer {admin_token}'})
+        response = admin_client.get('/applications')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'applications' in data
         assert 'count' in data
     
-    def test_unknown_role_applications(self, client):
+    def test_unknown_role_applications(self, client, test_db):
         """Test applications endpoint with unknown role"""
-        import jwt
-        from datetime import datetime, timedelta
-        
         # Create user with unknown role
-        with app.app_context():
-            db = get_db()
-            users = db.users
-            result = users.insert_one({
-                'email': 'unknown@test.com',
-                'password': hash_password('password'),
-                'role': 'guest',  # Unknown role
-                'created_at': datetime.utcnow()
-            })
-            
-            # Create token manually
-            token = jwt.encode({
-                'user_id': str(result.inserted_id),
-                'role': 'guest',
-                'exp': datetime.utcnow() + timedelta(hours=1)
-            }, app.config['SECRET_KEY'], algorithm="HS256")
+        result = test_db.users.insert_one({
+            'email': 'unknown@test.com',
+            'password': auth.hash_password('password'),
+            'role': 'guest',  # Unknown role
+            'created_at': _FIXED_TS
+        })
+        
+        # Create token manually
+        token = _sign_token(str(result.inserted_id), 'guest')
         
         # Try to get applications with unknown role
         response = client.get('/applications',
-                             headers={'Authorization': f'Bearer {token}'})
+                             headers=_bearer(token))
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['count'] == 0  # Should return empty for unknown roles
+        
+        # An unknown role holds no permissions
+        response = client.get('/members', headers=_bearer(token))
+        assert response.status_code == 403
     
 
 
+# Jobs the filtering tests search
+FILTER_JOBS = (
+    {
+        'title': 'Fitness Trainer',
+        'description': 'Test',
+        'location': 'Downtown',
+        'work_type': 'Full-time'
+    },
+    {
+        'title': 'Front Desk Executive',
+        'description': 'Test',
+        'location': 'Central',
+        'work_type': 'Part-time'
+    },
+)
+
+
+def _index_scans(stage):
+    """Yields the IXSCAN stages of an explain() plan"""
+    if stage['stage'] == 'IXSCAN':
+        yield stage
+    for child in [stage.get('inputStage'), *stage.get('inputStages', ())]:
+        if child:
+            yield from _index_scans(child)
+
+
+@pytest.fixture(scope="class")
+def filter_jobs(test_db, _seed_users):
+    """Post FILTER_JOBS once for the class instead of once per test"""
+    with _shared_jobs(test_db, _seed_users['admin'], *FILTER_JOBS) as job_ids:
+        yield job_ids
+
+
+@pytest.mark.usefixtures('filter_jobs')
 class TestJobFiltering:
     """Test job filtering"""
     
-    def test_filter_by_title(self, client, admin_token):
-        # Create jobs
-        client.post('/jobs',
-                   data=json.dumps({
-                       'title': 'Fitness Trainer',
-                       'description': 'Test',
-                       'location': 'Downtown',
-                       'work_type': 'Full-time'
-                   }),
-                   headers={'Authorization': f'Bearer {admin_token}'},
-                   content_type='application/json')
-        
-        client.post('/jobs',
-                   data=json.dumps({
-                       'title': 'Front Desk Executive',
-                       'description': 'Test',
-                       'location': 'Central',
-                       'work_type': 'Part-time'
-                   }),
-                   headers={'Authorization': f'Bearer {admin_token}'},
-                   content_type='application/json')
-        
-        # Filter by title
+    def test_filter_by_title(self, client):
         response = client.get('/jobs?title=Fitness')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert len(data) >= 1
         assert 'Fitness' in data[0]['title']
+
+    @pytest.mark.parametrize('title, expected', [
+        ('fitness', ['Fitness Trainer']),
+        ('FITNESS TR', ['Fitness Trainer']),
+        ('Trainer', []),
+    ])
+    def test_filter_by_title_is_case_insensitive_prefix(self, client, title, expected):
+        response = client.get(f'/jobs?title={title}')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [job['title'] for job in data] == expected
+        assert all('title_lc' not in job and 'location_lc' not in job for job in data)
     
-    def test_filter_by_location(self, client, admin_token):
-        client.post('/jobs',
-                   data=json.dumps({
-                       'title': 'Test Job',
-                       'description': 'Test',
-                       'location': 'Downtown',
-                       'work_type': 'Full-time'
-                   }),
-                   headers={'Authorization': f'Bearer {admin_token}'},
-                   content_type='application/json')
-        
-        response = client.get('/jobs?location=Downtown')
+    def test_filter_by_location(self, client):
+        response = client.get('/jobs?location=downTown')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert len(data) >= 1
     
-    def test_filter_by_work_type(self, client, admin_token):
-        client.post('/jobs',
-                   data=json.dumps({
-                       'title': 'Test Job',
-                       'description': 'Test',
-                       'location': 'Test',
-                       'work_type': 'Full-time'
-                   }),
-                   headers={'Authorization': f'Bearer {admin_token}'},
-                   content_type='application/json')
-        
+    def test_filter_by_work_type(self, client):
         response = client.get('/jobs?work_type=Full-time')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert len(data) >= 1
+    
+    def test_filter_fields_projection(self, client):
+        response = client.get('/jobs?fields=title,location')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data) >= 1
+        assert set(data[0]) == {'_id', 'title', 'location'}
+    
+    def test_filter_fields_unknown(self, client):
+        response = client.get('/jobs?fields=title,password')
+        assert response.status_code == 400
 
+    @realmongo
+    @pytest.mark.parametrize('args', [
+        {'title': 'Fitness'},
+        {'location': 'Down'},
+        {'work_type': 'Full-time'},
+        {'work_type': 'Full-time', 'location': 'Down'},
+    ])
+    def test_filter_uses_index(self, test_db, args):
+        """Each GET /jobs filter reads only the index keys that start with its term"""
+        plan = test_db.jobs.find(_jobs_query(args)).explain()['queryPlanner']['winningPlan']
+        bounds = {}
+        for scan in _index_scans(plan.get('queryPlan', plan)):
+            bounds.update(scan['indexBounds'])
+        for field, term in args.items():
+            # Title and location are matched on their lowercased copies
+            if field in SEARCH_KEYS:
+                field, term = SEARCH_KEYS[field], term.lower()
+            # e.g. '["down", "dowo")'; an unbounded scan reads '[MinKey, MaxKey]' or '["", {})'
+            assert bounds[field][0].startswith(f'["{term}'), bounds